@@ -1,4 +1,6 @@
-import datetime
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
 
 import numpy as np
@@ -9,8 +11,14 @@ np.set_printoptions(precision=4, linewidth=94, suppress=True)
 pd.set_option('display.max_columns', None)
 
 
+# ANSI colouring only pays off on an interactive console - plain text otherwise
+_isatty = sys.stdout.isatty()
+
+
 def cp(s: Any = '', /, display: int = 0, fg: int = 39, bg: int = 48) -> str:
     """Return the string for color print in the (IPython) console"""
+    if not _isatty:
+        return str(s)
     return f'\033[{display};{fg};{bg}m{s}\033[0m'
 
 
@@ -27,8 +35,12 @@ def print_dict(d: dict, /) -> None:
     -------
     None
     """
+    buf = []
     for k, v in d.items():
-        print(cp(cp(f'\n{k}: {type(v)}\n', fg=34, display=4), display=1) + cp(f'\n{v}\n'))
+        buf.append(cp(cp(f'\n{k}: {type(v)}\n', fg=34, display=4), display=1))
+        buf.append(cp(f'\n{v}\n'))
+        buf.append('\n')
+    sys.stdout.write(''.join(buf))
 
 
 def is_numeric(x: Any, /) -> bool:
@@ -53,13 +65,14 @@ def _ts_valid_pd(ts: Any, /) -> 'str | None':
     if not isinstance(ts, (pd.Series, pd.DataFrame)):
         return '`ts` must be either pandas.Series or pandas.DataFrame!'
     if not (
-        all(isinstance(i, (datetime.datetime, datetime.date)) for i in ts.index)
+        isinstance(ts.index, pd.DatetimeIndex)
         or pd.api.types.is_datetime64_any_dtype(ts.index)
+        or pd.api.types.infer_dtype(ts.index, skipna=True) in {'datetime', 'date', 'empty'}
     ):
         return f'Wrong dtype in the index: `{ts.index.dtype}` detected!'
-    if not (ts.index.size == ts.index.unique().size):
+    if not ts.index.is_unique:
         return '`ts.index` must be unique!'
-    if not all(ts.index == ts.index.sort_values(ascending=True)):
+    if not ts.index.is_monotonic_increasing:
         return '`ts.index` must be in chronicle order!'
     if isinstance(ts, pd.DataFrame):
         if ts.shape[1] < 1:
@@ -72,6 +85,23 @@ def _ts_valid_pd(ts: Any, /) -> 'str | None':
         return 'The Series must contain real numbers!'
 
 
+def _ts_step_clean(x: pd.DataFrame, minimum_time_step_in_second: int) -> 'int | None':
+    """Identify the step (in seconds) of an already-validated, empty-row-dropped series"""
+    if x.shape[0] in (0, 1):
+        return None
+    diff_in_second = np.diff(pd.DatetimeIndex(x.index).as_unit('s').asi8)
+    step_minimum = np.where(
+        diff_in_second >= minimum_time_step_in_second, diff_in_second, np.iinfo(np.int64).max
+    ).min()
+    return -1 if (diff_in_second % step_minimum).any() else int(step_minimum)
+
+
+# Nanosecond spans used by `hourly_2_daily` (day-bucketing) and `ts_info` (Length_yr)
+_ns_hour = 3_600_000_000_000
+_ns_day = 86_400_000_000_000
+_ns_year = 365.2422 * 86_400 * 1e9
+
+
 def ts_step(
     ts: 'pd.DataFrame | pd.Series', minimum_time_step_in_second: int = 60
 ) -> 'int | None':
@@ -99,12 +129,14 @@ def ts_step(
     """
     if err_str := _ts_valid_pd(ts):
         raise TypeError(cp(err_str, fg=35))
-    x = ts.dropna(axis=0, how='all')
-    if x.shape[0] in (0, 1):
-        return None
-    diff_in_second = (pd.Series(x.index).diff() / np.timedelta64(1, 's')).values[1:]
-    step_minimum = diff_in_second[diff_in_second >= minimum_time_step_in_second].min()
-    return int(step_minimum) if (diff_in_second % step_minimum == 0).all() else -1
+    return _ts_step_clean(ts.dropna(axis=0, how='all'), minimum_time_step_in_second)
+
+
+def _pad_asfreq(r: pd.DataFrame, step: int) -> pd.DataFrame:
+    """Pad an already-validated, empty-row-dropped frame to a regular `step` (in secs)"""
+    r = r.asfreq(freq=f'{step}s')
+    r.index.freq = None
+    return r
 
 
 def na_ts_insert(ts: 'pd.DataFrame | pd.Series') -> pd.DataFrame:
@@ -126,11 +158,28 @@ def na_ts_insert(ts: 'pd.DataFrame | pd.Series') -> pd.DataFrame:
         * As for irregular time series, The empty-row-removed DataFrame returned.
         * The attributes in `ts.attrs` is maintained after using it.
     """
-    r = pd.DataFrame(ts).dropna(axis=0, how='all')
-    if (step := ts_step(ts)) in {-1, None}:
+    if err_str := _ts_valid_pd(ts):
+        raise TypeError(cp(err_str, fg=35))
+    r = (ts if isinstance(ts, pd.DataFrame) else ts.to_frame()).dropna(axis=0, how='all')
+    freq = getattr(ts.index, 'freq', None)
+    if isinstance(freq, pd.offsets.Tick) and freq.nanos >= 60 * 1_000_000_000:
+        step = freq.nanos // 1_000_000_000
+    else:
+        step = _ts_step_clean(r, 60)
+    if step in {-1, None}:
         return r
-    r = r.asfreq(freq=f'{step}s')
-    r.index.freq = None
+    if (
+        r.shape[0] > 1
+        and isinstance(r.index, pd.DatetimeIndex)
+        and r.index.freq is None
+        and int(pd.Timedelta(r.index[-1] - r.index[0]).total_seconds()) == step * (r.shape[0] - 1)
+    ):
+        # Nothing was dropped - the index is already dense, no reindex needed.
+        # Restricted to a DatetimeIndex: `asfreq` also coerces e.g. an object
+        # index of `datetime.date` values, and that coercion must still happen
+        r.attrs = ts.attrs
+        return r
+    r = _pad_asfreq(r, step)
     r.attrs = ts.attrs
     return r
 
@@ -174,17 +223,66 @@ def hourly_2_daily(
         raise ValueError('`prop` must be in [0, 1]!\n')
     hts_c = na_ts_insert(hts).dropna()
     site = hts_c.columns[0]
-    date_new = (hts_c.index - pd.Timedelta(f'{3600 * (1 + day_starts_at)}s')).date
-    u = pd.DataFrame({'Date': date_new, 'Value': hts_c.squeeze().values}).set_index('Date')
-    u['Prop'] = u.groupby('Date', sort=False)['Value'].transform('size') / 24
-    return (
-        u.query('Prop >= @prop')
-        .groupby('Date', sort=False)
-        .agg(Agg=('Value', agg))
-        .rename(columns={'Agg': f'Agg_{agg.__name__}'})
-        .pipe(na_ts_insert)
-        .assign(Site=site)
+    if hts_c.empty:
+        return pd.DataFrame(
+            {f'Agg_{agg.__name__}': pd.Series(dtype=float)},
+            index=pd.Index([], name='Date'),
+        ).assign(Site=site)
+    # Bucket each stamp into an integer day id (shifted by `day_starts_at`) - a single
+    # int64 pass instead of boxing every element into a `datetime.date` object
+    offset_ns = _ns_hour * (1 + day_starts_at)
+    day_id = (pd.DatetimeIndex(hts_c.index).as_unit('ns').asi8 - offset_ns) // _ns_day
+    counts = np.bincount(day_id - day_id.min())
+    keep = counts[day_id - day_id.min()] / 24 >= prop
+    values = hts_c.iloc[:, 0].to_numpy(copy=False)
+    day_keep, v_keep = day_id[keep], values[keep]
+    if not day_keep.size:
+        return pd.DataFrame(
+            {f'Agg_{agg.__name__}': pd.Series(dtype=float)},
+            index=pd.Index([], name='Date'),
+        ).assign(Site=site)
+    if agg is pd.Series.mean or agg is np.mean:
+        # The dominant case: one bincount pass per day, no hash table, no per-group call
+        ids = day_keep - day_keep.min()
+        cnts = np.bincount(ids)
+        present = cnts > 0
+        agg_v = np.bincount(ids, weights=v_keep)[present] / cnts[present]
+        day_out = np.flatnonzero(present) + day_keep.min()
+    else:
+        agg_s = pd.Series(v_keep).groupby(day_keep, sort=False).agg(agg)
+        agg_v, day_out = agg_s.to_numpy(), agg_s.index.to_numpy()
+        valid = ~pd.isna(agg_v)
+        agg_v, day_out = agg_v[valid], day_out[valid]
+    date_new = pd.to_datetime(day_out * _ns_day).date
+    out = pd.DataFrame(
+        {f'Agg_{agg.__name__}': agg_v},
+        index=pd.Index(date_new, name='Date'),
     )
+    # The frame is built valid by construction - pad directly instead of re-running
+    # the full validation + step scan that `na_ts_insert` would do
+    day_diff = np.diff(day_out)
+    if day_diff.size:
+        step_day = day_diff.min()
+        if not (day_diff % step_day).any():
+            out = _pad_asfreq(out, int(step_day) * 86_400)
+    return out.assign(Site=site)
+
+
+# Wide panels fan the per-column stats out over threads from this width onwards
+_site_stats_parallel_threshold = 64
+
+
+def _site_stats(ts: pd.DataFrame, cols: list) -> list:
+    """Collect the (Site, Start, End, n) tuple of each column in `cols`"""
+    idx, out = ts.index, []
+    for col in cols:
+        mask = ts[col].notna().to_numpy()
+        if not mask.any():
+            out.append((str(col), pd.NaT, pd.NaT, np.nan))
+            continue
+        first, last = mask.argmax(), mask.size - 1 - mask[::-1].argmax()
+        out.append((str(col), idx[first], idx[last], int(mask.sum())))
+    return out
 
 
 def ts_info(ts: 'pd.DataFrame | pd.Series') -> pd.DataFrame:
@@ -206,20 +304,24 @@ def ts_info(ts: 'pd.DataFrame | pd.Series') -> pd.DataFrame:
         return None
     if isinstance(ts, pd.Series):
         ts = ts.to_frame()
-    col_name = pd.Index(ts.columns.tolist(), dtype=str, name='Site')
-    col_name_ = [f'{i}_' for i in col_name]
-    empty_df = pd.DataFrame(index=pd.Index(col_name_, dtype=str, name='Site'))
-    ts_w = ts.reset_index()
-    ts_w.columns = ['Time'] + col_name_
-    ts_l = ts_w.melt(id_vars='Time', var_name='Site', value_name='V').dropna()
-    info = ts_l.groupby('Site', sort=False).agg(
-        Start=('Time', 'min'),
-        End=('Time', 'max'),
-        n=('V', pd.Series.count),
-    )
+    cols = ts.columns.tolist()
+    if len(cols) < _site_stats_parallel_threshold:
+        out = _site_stats(ts, cols)
+    else:
+        # Columns are independent, and the mask reductions are C code that release
+        # the GIL - fan chunks of columns (not single columns) out over threads
+        n_jobs = min(os.cpu_count() or 1, 8)
+        size = -(-len(cols) // n_jobs)
+        chunks = [cols[i : i + size] for i in range(0, len(cols), size)]
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            out = [i for part in pool.map(lambda c: _site_stats(ts, c), chunks) for i in part]
+    info = pd.DataFrame(out, columns=['Site', 'Start', 'End', 'n'])
     d_yr = 365.2422
-    info['Length_yr'] = (info['End'] - info['Start']) / pd.Timedelta(f'{d_yr}D')
-    info = empty_df.join(info, how='left').set_index(col_name).reset_index()
+    start_i8 = info['Start'].to_numpy(dtype='datetime64[ns]').view('i8')
+    end_i8 = info['End'].to_numpy(dtype='datetime64[ns]').view('i8')
+    length_yr = (end_i8 - start_i8) / _ns_year
+    length_yr[start_i8 == np.iinfo(np.int64).min] = np.nan  # NaT-backed rows
+    info['Length_yr'] = length_yr
     if con == -1:
         return info.drop('n', axis=1)
     step_day = con / (3600 * 24)
@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 import datetime
+import logging
+from functools import lru_cache
 from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
 import polars as pl
-import polars.selectors as cs
 
 # Some display settings for numpy Array, Pandas and Polars DataFrame
 np.set_printoptions(precision=4, linewidth=94, suppress=True)
@@ -13,10 +14,21 @@ pd.set_option('display.max_columns', None)
 pl.Config.set_fmt_str_lengths(80)
 pl.Config.set_tbl_cols(-1)
 
+logger = logging.getLogger(__name__)
+
+
+_reset = '\033[0m'
+
+
+@lru_cache(maxsize=256)
+def _cp_prefix(display: int, fg: int, bg: int) -> str:
+    """Memoise the ANSI escape prefix for `cp` - few colour combos recur a lot"""
+    return f'\033[{display};{fg};{bg}m'
+
 
 def cp(s: Any = '', /, display: int = 0, fg: int = 39, bg: int = 48) -> str:
     """Return the string for color print in the (IPython) console"""
-    return f'\033[{display};{fg};{bg}m{s}\033[0m'
+    return _cp_prefix(display, fg, bg) + str(s) + _reset
 
 
 def print_dict(d: dict, /) -> None:
@@ -36,6 +48,10 @@ def print_dict(d: dict, /) -> None:
         print(cp(cp(f'\n{k}: {type(v)}\n', fg=34, display=4), display=1) + cp(f'\n{v}\n'))
 
 
+# Concrete numeric types - `bool` is excluded naturally as `type(True) is bool`
+_numeric_types = frozenset({int, float, complex})
+
+
 def is_numeric(x: Any, /) -> bool:
     """
     Is `x` numeric?
@@ -50,7 +66,7 @@ def is_numeric(x: Any, /) -> bool:
     bool
         `True` (is numeric) or `False` (not numeric).
     """
-    return isinstance(x, (int, float, complex)) and not isinstance(x, bool)
+    return type(x) in _numeric_types
 
 
 def _ts_valid_pd(ts: Any, /) -> 'str | None':
@@ -58,13 +74,13 @@ def _ts_valid_pd(ts: Any, /) -> 'str | None':
     if not isinstance(ts, (pd.Series, pd.DataFrame)):
         return '`ts` must be either pandas.Series or pandas.DataFrame!'
     if not (
-        all(isinstance(i, (datetime.datetime, datetime.date)) for i in ts.index)
-        or pd.api.types.is_datetime64_any_dtype(ts.index)
+        pd.api.types.is_datetime64_any_dtype(ts.index)
+        or ts.index.inferred_type in {'datetime', 'date', 'empty'}
     ):
         return f'Wrong dtype in the index: `{ts.index.dtype}` detected!'
-    if not (ts.index.size == ts.index.unique().size):
+    if not ts.index.is_unique:
         return '`ts.index` must be unique!'
-    if not all(ts.index == ts.index.sort_values(ascending=True)):
+    if not ts.index.is_monotonic_increasing:
         return '`ts.index` must be in chronicle order!'
     if isinstance(ts, pd.DataFrame):
         if ts.shape[1] < 1:
@@ -77,31 +93,55 @@ def _ts_valid_pd(ts: Any, /) -> 'str | None':
         return 'The Series must contain real numbers!'
 
 
+def _split_cols(ts: pl.DataFrame, /) -> 'tuple[list[str], list[str]]':
+    """Split the column names into (temporal, numeric) with one walk over the schema"""
+    col_dt, col_v = [], []
+    for name, dtype in ts.schema.items():
+        if dtype.is_temporal():
+            col_dt.append(name)
+        elif dtype.is_numeric():
+            col_v.append(name)
+    return col_dt, col_v
+
+
 def _ts_valid_pl(ts: Any, /) -> 'str | None':
     """Validate the input time series: `None` returned as valid"""
     if isinstance(ts, pl.DataFrame):
         if ts.width < 2:
             return '`ts` must have one datetime column and the rest of numeric column(s)!'
-        if len(col_dt := ts.select(cs.temporal()).columns) != 1:
+        col_dt, col_v = _split_cols(ts)
+        if len(col_dt) != 1:
             return '`ts` must have one datetime column!'
-        if ts[col_dt[0]].unique().len() != ts[col_dt[0]].len():
+        s_dt = ts.get_column(col_dt[0])
+        if s_dt.n_unique() != ts.height:
             return f'The values in the temporal column {col_dt} must be unique!'
-        if not ts.sort(by=col_dt, descending=False).equals(ts):
+        if not s_dt.is_sorted(descending=False):
             return f'Column {col_dt} must be sorted in chronicle order!'
-        if ts.width != ts.select(cs.numeric()).width + 1:
+        if ts.width != len(col_v) + 1:
             return f'Apart from column {col_dt}, the rest column(s) must be numeric!'
         return None
     return '`ts` must be a polars.DataFrame!'
 
 
-def ts_step(ts: pl.DataFrame, minimum_time_step_in_second: int = 60) -> 'int | None':
+def _keep_any_value(col_v: 'list[str]', /) -> pl.Expr:
+    """Expression keeping the rows where at least one numeric column holds a value"""
+    if len(col_v) == 1:
+        return pl.col(col_v[0]).is_not_null()
+    return pl.any_horizontal(pl.col(c).is_not_null() for c in col_v)
+
+
+def ts_step(
+    ts: 'pl.DataFrame | pl.Series', minimum_time_step_in_second: int = 60
+) -> 'int | None':
     """
     Identify the temporal resolution (in seconds) for a time series
 
     Parameters
     ----------
-    ts : pl.DataFrame
-        A Polars time series - 1st column as date/datetime, and other column(s) as numeric
+    ts : pl.DataFrame | pl.Series
+        A Polars time series - 1st column as date/datetime, and other column(s) as
+        numeric. A bare date/datetime Series works as well - handy for checking a
+        column directly without wrapping it in a dummy DataFrame.
     minimum_time_step_in_second : int, default=60
         The minimum threshold of the time step that can be identified.
 
@@ -117,41 +157,80 @@ def ts_step(ts: pl.DataFrame, minimum_time_step_in_second: int = 60) -> 'int | N
         * Any integer **above `0`**: time series is regular (step in secs).
         * **`None`**: contains no values or a single value.
     """
-    if err_str := _ts_valid_pl(ts):
-        raise TypeError(err_str)
-    col_dt = ts.select(cs.temporal()).columns[0]
-    col_v = ts.select(cs.numeric()).columns
-    x = ts.fill_nan(None).filter(~pl.all_horizontal(pl.col(col_v).is_null()))
-    if len(x) in {0, 1}:
-        return None
-    diff_in_second = x.select(pl.col(col_dt)).to_series().diff(1).dt.total_seconds()[1:]
-    step_min = diff_in_second.filter(diff_in_second >= minimum_time_step_in_second).min()
-    return int(step_min) if (diff_in_second % step_min == 0).all() else -1
-
-
-def is_ts_daily(ts: pl.DataFrame, /) -> bool:
-    """Check if a time series (in Polars DataFrame) is daily (day starts at 0 o'clock)"""
-    if err_str := _ts_valid_pl(ts):
-        raise TypeError(err_str)
-    col_dt = ts.select(cs.temporal()).columns[0]
-    if not pl.Date.is_(ts[col_dt].dtype):
-        time_no_hms = all(
-            [
-                ts[col_dt].dt.hour().eq(0).all(),
-                ts[col_dt].dt.minute().eq(0).all(),
-                ts[col_dt].dt.second().eq(0).all(),
-            ]
+    if isinstance(ts, pl.Series):
+        if not ts.dtype.is_temporal():
+            raise TypeError('`ts` as a Series must be of date/datetime dtype!')
+        if ts.n_unique() != ts.len():
+            raise TypeError('The values in the temporal Series `ts` must be unique!')
+        if not ts.is_sorted(descending=False):
+            raise TypeError('The temporal Series `ts` must be in chronicle order!')
+        diff_in_second = ts.diff(1).dt.total_seconds().drop_nulls().to_numpy()
+    else:
+        if err_str := _ts_valid_pl(ts):
+            raise TypeError(err_str)
+        (col_dt, *_), col_v = _split_cols(ts)
+        diff_in_second = (
+            ts.lazy()
+            .fill_nan(None)
+            .filter(_keep_any_value(col_v))
+            .select(pl.col(col_dt).diff(1).dt.total_seconds().alias('d'))
+            .drop_nulls('d')
+            .collect()
+            .to_series()
+            .to_numpy()
         )
-        return (ts_step(ts) == 86400) and time_no_hms
+    if diff_in_second.size == 0:
+        return None
+    step_candidate = diff_in_second[diff_in_second >= minimum_time_step_in_second]
+    if step_candidate.size == 0:
+        return -1
+    step_min = int(step_candidate.min())
+    # The steps are uniform iff `step_min` divides their gcd; fold the gcd chunk by
+    # chunk so irregular series bail out at the first inversion instead of scanning all
+    g = 0
+    for i in range(0, diff_in_second.size, 65_536):
+        g = int(np.gcd(g, np.gcd.reduce(diff_in_second[i:i + 65_536])))
+        if g < minimum_time_step_in_second:
+            return -1
+    return step_min if g % step_min == 0 else -1
+
+
+def is_ts_daily(ts: 'pl.DataFrame | pl.Series', /, step: 'int | None' = None) -> bool:
+    """
+    Check if a time series (in Polars DataFrame) is daily (day starts at 0 o'clock)
+
+    A bare date/datetime Series is accepted too (see `ts_step`). Pass `step` (a
+    known `ts_step(ts)` result) to skip recomputing the resolution.
+    """
+    if isinstance(ts, pl.Series):
+        if not ts.dtype.is_temporal():
+            raise TypeError('`ts` as a Series must be of date/datetime dtype!')
+        s_dt = ts
+    else:
+        if err_str := _ts_valid_pl(ts):
+            raise TypeError(err_str)
+        s_dt = ts.get_column(_split_cols(ts)[0][0])
+    if s_dt.dtype != pl.Date:
+        # Midnight <=> the epoch timestamp divides the day: one scan instead of
+        # separate hour/minute/second decompositions
+        time_no_hms = (s_dt.dt.timestamp('us') % 86_400_000_000).eq(0).all()
+        if step is None:
+            step = ts_step(ts)
+        return (step == 86400) and time_no_hms
     return True
 
 
 def ts_pd2pl(ts: 'pd.Series | pd.DataFrame') -> pl.DataFrame:
     """Convert the timeseries from Pandas DataFrame to Polars DataFrame"""
     if (err_str := _ts_valid_pd(ts)) is None:
-        print('TimeSeries: Pandas DataFrame -> Polars DataFrame!')
-        ts_pl = pl.DataFrame(pd.DataFrame(ts).reset_index()).fill_nan(None)
-        col_dt = ts_pl.select(cs.temporal()).columns[0]
+        logger.debug('TimeSeries: Pandas DataFrame -> Polars DataFrame!')
+        ts_pl = pl.from_pandas(
+            ts if isinstance(ts, pd.DataFrame) else ts.to_frame(), include_index=True
+        ).fill_nan(None)
+        if ts.index.name is None:
+            # `reset_index()` used to label a nameless index as 'index' - keep that
+            ts_pl = ts_pl.rename({ts_pl.columns[0]: 'index'})
+        col_dt = _split_cols(ts_pl)[0][0]
         if is_ts_daily(ts_pl):
             ts_pl = ts_pl.with_columns(pl.col(col_dt).cast(pl.Date).alias(col_dt))
         return ts_pl.sort(col_dt)
@@ -161,12 +240,14 @@ def ts_pd2pl(ts: 'pd.Series | pd.DataFrame') -> pl.DataFrame:
 def ts_pl2pd(ts: pl.DataFrame) -> pd.DataFrame:
     """Convert the timeseries from Polars DataFrame to Pandas DataFrame"""
     if (err_str := _ts_valid_pl(ts)) is None:
-        print('TimeSeries: Polars DataFrame -> Pandas DataFrame!')
-        return ts.to_pandas().set_index(ts.select(cs.temporal()).columns[0])
+        logger.debug('TimeSeries: Polars DataFrame -> Pandas DataFrame!')
+        return ts.to_pandas().set_index(_split_cols(ts)[0][0])
     raise TypeError(err_str)
 
 
-def na_ts_insert(ts: pl.DataFrame) -> pl.DataFrame:
+def na_ts_insert(
+    ts: pl.DataFrame, step: 'int | None' = None, engine: str = 'auto'
+) -> pl.DataFrame:
     """
     Pad Null value into a valid time series (Polars DataFrame)
 
@@ -174,6 +255,11 @@ def na_ts_insert(ts: pl.DataFrame) -> pl.DataFrame:
     ----------
     ts : pl.DataFrame
         A Polars DataFrame - 1st column as date/datetime, and rest column(s) as numeric
+    step : int | None, optional, default=None
+        A known `ts_step(ts)` result - passed in to skip recomputing the resolution.
+    engine : str, optional, default='auto'
+        Engine passed to `collect()` - 'streaming' keeps the peak memory down on
+        large gap-filled frames.
 
     Returns
     -------
@@ -184,25 +270,30 @@ def na_ts_insert(ts: pl.DataFrame) -> pl.DataFrame:
     -----
         As for irregular time series, The empty-numeric-row-removed DataFrame returned.
     """
-    col_dt = ts.select(cs.date() | cs.datetime()).columns[0]
-    r = ts.lazy().fill_nan(None).filter(~pl.all_horizontal(cs.numeric().is_null()))
-    if (step := ts_step(ts)) in {-1, None}:
-        return r.sort(col_dt).collect()
-    s, e = (
-        r.select(
-            pl.col(col_dt).min().alias('s'),
-            pl.col(col_dt).max().alias('e'),
-        )
-        .collect()
-        .row(0)
-    )
-    dt_col: pl.Expr = (
-        pl.date_range(s, e, f'{int(step / 86400)}d')
-        if pl.Date.is_(ts[col_dt].dtype)
-        else pl.datetime_range(s, e, f'{step}s')
+    (col_dt, *_), col_v = _split_cols(ts)
+    r = ts.lazy().fill_nan(None).filter(_keep_any_value(col_v))
+    if step is None:
+        step = ts_step(ts)
+    if step in {-1, None}:
+        return r.sort(col_dt).collect(engine=engine)
+    out = r.collect(engine=engine)
+    # A supplied `step` skips the internal `ts_step`, which is what reports an
+    # all-null or single-value series (as `None`) - such frames cannot be
+    # upsampled, so hand them back as-is, mirroring the `step is None` path
+    if out.height in (0, 1):
+        return out
+    # `upsample` inserts the missing rows in place - no auxiliary range frame and
+    # no join hashtable; a timedelta skips the interval-string parse
+    every = (
+        datetime.timedelta(days=step // 86_400)
+        if ts.schema[col_dt] == pl.Date
+        else datetime.timedelta(seconds=step)
     )
-    dt: pl.LazyFrame = pl.LazyFrame().with_columns(dt_col.alias(col_dt))
-    return dt.join(r, on=col_dt, how='left').sort(col_dt).collect()
+    return out.upsample(time_column=col_dt, every=every)
+
+
+# The aggregations with a direct group-by fast path - dispatched on identity
+_agg_fast = {pl.mean: 'mean', pl.sum: 'sum', pl.min: 'min', pl.max: 'max'}
 
 
 def hourly_2_daily(
@@ -242,29 +333,38 @@ def hourly_2_daily(
         raise ValueError('`day_starts_at` must be an integer in [0, 23]!\n')
     if prop < 0 or prop > 1:
         raise ValueError('`prop` must be in [0, 1]!\n')
-    col_dt = hts.select(cs.temporal()).columns[0]
-    col_v = hts.select(cs.numeric()).columns[0]
+    (col_dt, *_), (col_v, *_) = _split_cols(hts)
+    # Dynamic daily windows starting at `1 + day_starts_at` o'clock: grouping, count
+    # and aggregation happen in one engine pass (no `count().over(...)` shuffle)
     r = (
         hts.lazy()
         .select(col_dt, col_v)
         .fill_nan(None)
+        .drop_nulls(subset=col_v)
+        .group_by_dynamic(col_dt, every='1d', offset=f'{1 + day_starts_at}h', label='left')
+        .agg(
+            (
+                getattr(pl.col(col_v), name)()
+                if (name := _agg_fast.get(agg))
+                else agg(col_v)
+            ).alias(f'Agg_{agg.__name__}'),
+            pl.len().alias('n'),
+        )
+        .filter(pl.col('n').truediv(24).ge(prop))
         .select(
             pl.col(col_dt)
-            .sub(datetime.timedelta(seconds=3600 * (1 + day_starts_at)))
+            .dt.offset_by(f'-{1 + day_starts_at}h')
             .dt.date()
             .alias('Date'),
-            pl.col(col_v),
+            pl.col(f'Agg_{agg.__name__}'),
         )
-        .with_columns(pl.col(col_v).count().over('Date').truediv(24).alias('Prop'))
-        .filter(pl.col('Prop').ge(prop))
-        .drop_nulls(subset=col_v)
-        .group_by('Date', maintain_order=True)
-        .agg(agg(col_v).alias(f'Agg_{agg.__name__}'))
     )
     return r.collect().pipe(na_ts_insert).with_columns(pl.lit(col_v).alias('Site'))
 
 
-def ts_info(ts: pl.DataFrame) -> 'pl.DataFrame | None':
+def ts_info(
+    ts: pl.DataFrame, step: 'int | None' = None, engine: str = 'auto'
+) -> 'pl.DataFrame | None':
     """
     Obtain the data availability of the input time series (Polars DataFrame)
 
@@ -272,6 +372,11 @@ def ts_info(ts: pl.DataFrame) -> 'pl.DataFrame | None':
     ----------
     ts : pl.DataFrame
         A Polars input time series.
+    step : int | None, optional, default=None
+        A known `ts_step(ts)` result - passed in to skip recomputing the resolution.
+    engine : str, optional, default='auto'
+        Engine passed to `collect()` - 'streaming' lets the per-column scan spill
+        on frames that do not fit comfortably in memory.
 
     Returns
     -------
@@ -280,45 +385,45 @@ def ts_info(ts: pl.DataFrame) -> 'pl.DataFrame | None':
         * As for time series of the irregular time steps, 'Completion_%' is ignored.
         * `None` returned when there is no data in the input time series.
     """
-    if (con := ts_step(ts)) is None:
+    if (con := ts_step(ts) if step is None else step) is None:
         return None
-    col_dt = ts.select(cs.temporal()).columns
-    col_rest = ts.select(pl.exclude(col_dt)).columns
-    col_rest_ = [f'{i}_' for i in col_rest]
+    (col_dt, *_), col_rest = _split_cols(ts)
     seconds_year = (days_year := 365.2422) * 24 * 3600
-    info = (
+    # One horizontal pass: each column contributes its own first/last/count, so
+    # nothing gets melted into an (n_rows x n_sites) tall frame first
+    masks = [pl.col(c).fill_nan(None).is_not_null() for c in col_rest]
+    stats = (
         ts.lazy()
-        .rename(dict(zip(col_rest, col_rest_)))
-        .unpivot(on=col_rest_, index=col_dt, variable_name='Site', value_name='V')
-        .filter(pl.col('V').fill_nan(None).is_not_null())
-        .group_by('Site', maintain_order=True)
-        .agg(
-            pl.col(col_dt).min().alias('Start'),
-            pl.col(col_dt).max().alias('End'),
-            pl.col('V').len().alias('n'),
-        )
-        .with_columns(
-            pl.col('End')
-            .sub(pl.col('Start'))
-            .dt.total_seconds()
-            .truediv(seconds_year)
-            .alias('Length_yr')
+        .select(
+            *[pl.col(col_dt).filter(m).min().alias(f'{i}_s') for i, m in enumerate(masks)],
+            *[pl.col(col_dt).filter(m).max().alias(f'{i}_e') for i, m in enumerate(masks)],
+            *[m.sum().alias(f'{i}_n') for i, m in enumerate(masks)],
         )
+        .collect(engine=engine)
+        .row(0)
     )
-    info = (
-        pl.LazyFrame({'Site': col_rest_})
-        .join(info, on='Site', how='left', coalesce=True)
-        .with_columns(Site=pl.Series(col_rest))
+    k = len(col_rest)
+    info = pl.DataFrame(
+        {
+            'Site': col_rest,
+            'Start': pl.Series(stats[:k], dtype=ts.schema[col_dt]),
+            'End': pl.Series(stats[k:2 * k], dtype=ts.schema[col_dt]),
+            'n': pl.Series(stats[2 * k:], dtype=pl.UInt32),
+        }
+    ).with_columns(
+        pl.col('End')
+        .sub(pl.col('Start'))
+        .dt.total_seconds()
+        .truediv(seconds_year)
+        .alias('Length_yr')
     )
     if con == -1:
-        return info.drop('n').collect()
+        return info.drop('n')
     step_day = con / 86400
-    return (
-        info.with_columns(
-            (pl.col('Length_yr') * days_year + step_day).alias('N'),
-            (pl.col('Length_yr') + step_day / days_year),
-        )
-        .with_columns((pl.col('n') * step_day / pl.col('N') * 100).alias('Completion_%'))
-        .drop(['n', 'N'])
-        .collect()
-    )
+    # Both expressions read the as-aggregated 'Length_yr', so they fuse into a
+    # single pass with no transient 'N' column
+    return info.with_columns(
+        (pl.col('Length_yr') + step_day / days_year),
+        (pl.col('n') * step_day / (pl.col('Length_yr') * days_year + step_day) * 100)
+        .alias('Completion_%'),
+    ).drop('n')
@@ -7,6 +7,7 @@ Notes:
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import _tools.fun_s_pl as fpl
@@ -16,6 +17,11 @@ time_start = time.perf_counter()
 
 pl.Config.set_tbl_cols(-1)
 
+# The metadata columns repeat one value per file over thousands of rows - store
+# them as categoricals (integer codes) so the group-by/sort at the end works on
+# codes instead of strings, and the parquet files dictionary-encode them
+cat = pl.Categorical
+
 
 # Set up the path of the project
 path = Path('.')
@@ -44,11 +50,8 @@ path_folders = [i for i in path_csv.iterdir() if i.is_dir()]
 csv_files = [i for i in path_csv.rglob('*.csv') if i.is_file()]
 
 
-# Make a frame to store the long-format frame fro each folder inside the csv folder
-ts_l = pl.DataFrame()
-
-# For each folder, read the csv data files
-for path_folder in path_folders:
+def process_folder(path_folder: Path) -> 'pl.DataFrame | None':
+    """Read one folder of CSVs, write its parquet output(s), return the long frame"""
     # Get the list of CSV files in full path
     csv_paths = [i for i in path_folder.iterdir() if i.is_file()]
     csv_names = [i.name for i in csv_paths]
@@ -60,24 +63,21 @@ for path_folder in path_folders:
             '\nNo CSV files in folder '
             + fpl.cp(f'<{path_folder.relative_to(path)}>\n', fg=33)
         )
-        continue
+        return None
 
     # Make the DataFrame for each `folder_name`
-    ts = pl.DataFrame()
+    ts_parts = []
     for csv_path in csv_paths:
         tmp = pl.read_csv(csv_path, skip_rows=11, schema_overrides=[pl.String, pl.Float64])
         *param_part, plate = tmp.columns[-1].split('@')
         param = '@'.join(param_part)
-        desc_list = (
-            pl.read_csv(
-                csv_path,
-                n_rows=1,
-                skip_rows=6,
-                truncate_ragged_lines=True,
-            )
-            .item(0, 0)
-            .split(': ')
-        )
+        # The description sits on the 8th line of the header block - grab it
+        # directly rather than spinning up a second CSV parse of the same file
+        with open(csv_path, 'r', encoding='utf-8') as fi:
+            for _ in range(7):
+                next(fi)
+            desc_line = next(fi).rstrip('\n')
+        desc_list = desc_line.split(': ')
         desc = desc_list[-1]
         uid_hyphen, lab = (
             desc_list[0]
@@ -89,36 +89,36 @@ for path_folder in path_folders:
         # To make some column names the same as those from 'aquarius.orc.govt.nz/AQUARIUS'
         # Keep rows with `null`
         tmp = tmp.rename({tmp.columns[-1]: 'Value'}).with_columns(
-            pl.lit(param_dict.get(param)).alias('Unit'),
-            pl.lit(f'{param}.{lab}@{plate}').alias('ts_id'),
-            pl.lit(param).alias('Parameter'),
-            pl.lit(lab).alias('Label'),
-            pl.lit(plate).alias('Plate'),
-            pl.lit(plate_dict.get(plate)).alias('Name'),
-            pl.lit(uid_hyphen.replace('-', '')).alias('uid'),
-            pl.lit(f'{csv_path.name}').alias('CSV'),
-            pl.lit(desc).alias('Description'),
+            # Parse the timestamps once here - everything downstream (the long
+            # frame, the step check and the pivot) reuses the Datetime column
+            pl.col('TimeStamp').str.to_datetime('%Y-%m-%d %H:%M:%S'),
+            Unit=pl.lit(param_dict.get(param), dtype=cat),
+            ts_id=pl.lit(f'{param}.{lab}@{plate}'),
+            Parameter=pl.lit(param, dtype=cat),
+            Label=pl.lit(lab),
+            Plate=pl.lit(plate, dtype=cat),
+            Name=pl.lit(plate_dict.get(plate), dtype=cat),
+            uid=pl.lit(uid_hyphen.replace('-', '')),
+            CSV=pl.lit(f'{csv_path.name}', dtype=cat),
+            Description=pl.lit(desc),
         )
-        ts = pl.concat([ts, tmp], how='diagonal')
-
-    # Store the time series from each folder inside the csv filder
-    ts_l = pl.concat(
-        [
-            ts_l,
-            ts.with_columns(
-                pl.col.TimeStamp.str.to_datetime('%Y-%m-%d %H:%M:%S').name.keep(),
-                pl.lit(folder_name).alias('folder'),
-            ),
-        ],
-        how='vertical',
-    )
+        ts_parts.append(tmp)
+
+    # Concatenate the frames from this folder once (no quadratic re-copying);
+    # the per-file schemas are identical by construction, so skip diagonal's column-union
+    ts = pl.concat(ts_parts, how='vertical_relaxed')
+
+    # The time series from this folder, as handed back for the final summary
+    shard = ts.with_columns(pl.lit(folder_name, dtype=cat).alias('folder'))
 
     # Save the data as a parquet (for data sharing purpose) from this folder
     parquet_2_save = path_out / f'{folder_name}.parquet'
+    # zstd at a low level shrinks the repetitive metadata columns a lot
+    # for very little CPU (level 22 compresses harder but far slower)
     ts.write_parquet(
         parquet_2_save,
-        # compression='zstd',
-        # compression_level=22,
+        compression='zstd',
+        compression_level=3,
     )
     print(
         '\nThe CSV files in folder '
@@ -144,7 +144,7 @@ for path_folder in path_folders:
                 fg=34,
             )
         )
-        continue
+        return shard
 
     # - Ensure that 'Unit' and 'Parameter' are uniform (for each folder having the data)
     if ts.select(['Unit', 'Parameter']).unique().height > 1:
@@ -155,16 +155,11 @@ for path_folder in path_folders:
                 fg=34,
             )
         )
-        continue
+        return shard
 
     # - Ensure the time series having regular time step (<= 1 day)
-    udt_df = pl.DataFrame(
-        {
-            'Time': ts['TimeStamp'].unique().str.to_datetime('%Y-%m-%d %H:%M:%S').sort(),
-            'VV': 0,
-        }
-    )
-    step = fpl.ts_step(udt_df)
+    udt = ts['TimeStamp'].unique().sort()
+    step = fpl.ts_step(udt)
     if step == -1 or step > 86400:
         print(
             fpl.cp(
@@ -174,27 +169,32 @@ for path_folder in path_folders:
                 fg=34,
             )
         )
-        continue
+        return shard
 
     # When all criteria being met, make a wide Frame
-    w = (
-        ts.pivot(on='Name', index='TimeStamp', values='Value')
-        .with_columns(pl.col('TimeStamp').str.to_datetime('%Y-%m-%d %H:%M:%S'))
-        .sort(by='TimeStamp')
-    )
     daily_dict = {
         True: ['Date', '%Y-%m-%d', pl.Date],
         False: ['Time', '%Y-%m-%d %H:%M:%S', pl.Datetime],
     }
-    col_dt, fmt, fdt = daily_dict.get(fpl.is_ts_daily(udt_df))
-    ts_w = w.rename({'TimeStamp': col_dt}).cast({pl.Datetime: fdt}).pipe(fpl.na_ts_insert)
+    col_dt, fmt, fdt = daily_dict.get(fpl.is_ts_daily(udt, step=step))
+    # `pivot` is eager-only - run the chain after it lazily, so the parse,
+    # rename, cast and sort fuse into a single pass over the wide Frame
+    ts_w = (
+        ts.pivot(on='Name', index='TimeStamp', values='Value')
+        .lazy()
+        .rename({'TimeStamp': col_dt})
+        .with_columns(pl.col(col_dt).cast(fdt))
+        .sort(col_dt)
+        .collect()
+        .pipe(fpl.na_ts_insert, step=step)
+    )
 
     # Save the wide format as a parquet file
     parquet_2_save_wide = path_out / f'{folder_name}_wide.parquet'
     ts_w.with_columns(pl.col(col_dt).dt.strftime(fmt)).write_parquet(
         parquet_2_save_wide,
-        # compression='zstd',
-        # compression_level=22,
+        compression='zstd',
+        compression_level=3,
     )
     print(
         '\t'
@@ -203,12 +203,23 @@ for path_folder in path_folders:
         + fpl.cp(f'{parquet_2_save_wide.relative_to(path)}', fg=35),
         end='\n\n',
     )
+    return shard
+
+
+# Each folder is independent, so fan the work out over a thread pool - polars
+# releases the GIL for its Rust work, letting folders parse and write in parallel
+with ThreadPoolExecutor() as pool:
+    ts_l_parts = [i for i in pool.map(process_folder, path_folders) if i is not None]
 
 
 # Make a spreadsheet output for data chaecking purposes
+ts_l = pl.concat(ts_l_parts, how='vertical') if ts_l_parts else pl.DataFrame()
 tsv_2_save = path_out / 'data_range_pl.tsv'
+# Run the summary through the streaming engine: the grouped frame is
+# aggregated and written out in one go instead of being materialised twice
 data_summary = (
-    ts_l.drop_nulls()
+    ts_l.lazy()
+    .drop_nulls()
     .group_by(['folder', 'Name', 'ts_id', 'CSV'])
     .agg(
         Plate=pl.col('Plate').first(),
@@ -223,7 +234,7 @@ data_summary = (
     )
     .sort(['folder', 'Name', 'ts_id'])
 )
-data_summary.write_csv(tsv_2_save, separator='\t')
+data_summary.sink_csv(tsv_2_save, separator='\t')
 
 
 # Print out something showing it runs properly
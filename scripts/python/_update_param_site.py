@@ -1,5 +1,6 @@
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import urllib3
@@ -13,25 +14,28 @@ time_start = time.perf_counter()
 end_point = 'https://aquarius.orc.govt.nz/AQUARIUS/Publish/v2'
 login = 'api-read:PR98U3SKOczINoPHo7WM'
 http = urllib3.PoolManager()
-hdr = urllib3.util.make_headers(basic_auth=login)
+# `accept_encoding` lets AQ gzip its (verbose) JSON responses on the wire
+hdr = urllib3.util.make_headers(basic_auth=login, accept_encoding=True)
+
+
+def get_json(endpoint_name: str) -> dict:
+    """Issue the GET request on `endpoint_name` and parse the JSON response"""
+    r = http.request('GET', f'{end_point}/{endpoint_name}', headers=hdr)
+    return json.loads(r.data)
 
 
 # =========================================================================
 # --- 'GetLocationDescriptionList': plate numbers (ID) <-> Names (Site) ---
+# --- 'GetParameterList': Unit_id <-> Unit ---
+# --- The two round trips are independent -> issue them concurrently ---
 # =========================================================================
-url_desc = f'{end_point}/GetLocationDescriptionList'
-r_desc = http.request('GET', url_desc, headers=hdr)
-desc = json.loads(r_desc.data.decode('utf-8'))
+with ThreadPoolExecutor(max_workers=2) as pool:
+    future_desc = pool.submit(get_json, 'GetLocationDescriptionList')
+    future_param = pool.submit(get_json, 'GetParameterList')
+    desc, param = future_desc.result(), future_param.result()
+
 plate_list = desc.get('LocationDescriptions')
 plate_dict = {i.get('Identifier'): i.get('Name') for i in plate_list}
-
-
-# ============================================
-# --- 'GetParameterList': Unit_id <-> Unit ---
-# ============================================
-url_param = f'{end_point}/GetParameterList'
-r_param = http.request('GET', url_param, headers=hdr)
-param = json.loads(r_param.data.decode('utf-8'))
 param_list = param.get('Parameters')
 param_dict = {i.get('Identifier'): i.get('UnitIdentifier') for i in param_list}
 